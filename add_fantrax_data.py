@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Patches draft_tool.html with Fantrax data:
-1. Adds positional eligibility ('pos' field) to all hitter/pitcher data arrays
+1. Embeds hitter positional eligibility as a POSITIONS lookup and flags dual SP/RP pitchers
 2. Embeds a KEEPERS object keyed by Fantrax team name
 3. Updates TEAM_NAMES to use Fantrax team names
 """
@@ -9,7 +9,13 @@ Patches draft_tool.html with Fantrax data:
 import csv
 import json
 import re
-import unicodedata
+
+try:
+    import orjson
+except ImportError:  # optional; dumps_compact falls back to the stdlib encoder
+    orjson = None
+
+from name_utils import normalize
 
 FANTRAX_FILE = "/home/user/FBB/Fantrax-Players-Kevin's League.csv"
 HTML_FILE = "/home/user/FBB/draft_tool.html"
@@ -24,86 +30,222 @@ FANTRAX_TEAMS = [
 
 MY_TEAM = 'Skrey'
 
+# Variable assignment prefixes of the embedded projection arrays
+HITTER_PREFIXES = ['HITTERS_THEBAT = [', 'HITTERS_BATX = [', 'HITTERS_DC = [']
+PITCHER_PREFIX = 'const PITCHERS = ['
+
+# Start/end markers of the code blocks that get replaced wholesale
+POSITIONS_BLOCK = ('const POSITIONS = {', '};')
+TEAM_NAMES_BLOCK = ('const TEAM_NAMES = [', '];')
+INIT_KEEPERS_BLOCK = ('(function initKeepers() {', '})();')
+
+# Emitted after the last hitter array when the HTML has no POSITIONS block yet
+POSITIONS_COMMENT = (
+    "    // Fantrax positional eligibility by player name, shared by all three projection systems\n"
+    "    // (generated by add_fantrax_data.py) and copied onto each hitter as 'pos'\n"
+)
+POSITIONS_COPY = "    [HITTERS_THEBAT, HITTERS_BATX, HITTERS_DC].forEach(arr => arr.forEach(h => { h.pos = POSITIONS[h.name] || []; }));"
 
-def normalize(name):
-    """Strip accents, punctuation, and normalize whitespace for name matching."""
-    nfkd = unicodedata.normalize('NFKD', name)
-    n = ''.join(c for c in nfkd if not unicodedata.combining(c)).lower().strip()
-    n = n.replace("'", "").replace("\u2019", "").replace("-", " ").replace(".", "").replace(",", "")
-    return ' '.join(n.split())
+# 'My Team' or "My Team", quote style captured so the replacement keeps it
+_MY_TEAM_RE = re.compile(r"""(['"])My Team\1""")
 
+_JSON_DECODER = json.JSONDecoder()
 
-def load_fantrax():
-    """Load Fantrax CSV into a normalized-name lookup.
 
-    For duplicate names (e.g. 3 different "Jose Ramirez"), keeps the
-    highest-ranked entry (lowest RkOv) since that's the MLB player.
+def add_keeper(keepers, pos_ids, fx_name, pos, team, all_proj_names):
+    """
+    Append a rostered Fantrax player to keepers: { teamName: [ {name, type, pos?}, ... ] }
+    Uses projection names (with accents) so they match the embedded data.
+
+    Hitter eligibility strings like "C,1B" repeat across keepers, so each distinct
+    string is stored once in pos_ids (string -> index) and keepers refer to it by index.
+    """
+    if team not in keepers:
+        keepers[team] = []
+
+    positions = pos.split(',')
+    has_batting = any(p in ('C', '1B', '2B', '3B', 'SS', 'LF', 'CF', 'RF', 'UT') for p in positions)
+    has_pitching = any(p in ('SP', 'RP') for p in positions)
+
+    # Resolve to projection name
+    n = normalize(fx_name)
+    proj_name = all_proj_names.get(n)
+    if not proj_name:
+        # Special case Ohtani hitter
+        if fx_name == 'Shohei Ohtani-H':
+            proj_name = all_proj_names.get(normalize('Shohei Ohtani'))
+        if not proj_name:
+            print(f"  WARNING: Keeper '{fx_name}' ({team}) not found in projections, skipping")
+            return
+
+    if has_pitching and not has_batting:
+        ptype = 'SP' if 'SP' in positions else 'RP'
+        keepers[team].append({'name': proj_name, 'type': ptype})
+    else:
+        keeper = {'name': proj_name, 'type': 'H'}
+        if pos:
+            keeper['pos'] = pos_ids.setdefault(pos, len(pos_ids))
+        keepers[team].append(keeper)
+
+
+def parse_fantrax(all_proj_names):
+    """Read the Fantrax CSV in one pass into a normalized-name lookup and the keepers.
+
+    For duplicate names (e.g. 3 different "Jose Ramirez"), the lookup keeps the
+    highest-ranked entry (lowest RkOv) since that's the MLB player. Every
+    non-FA row becomes a keeper (see add_keeper), so the projection name
+    lookup must be built from the HTML first.
+
+    Returns (fantrax, keepers, pos_table).
     """
     fantrax = {}
     fantrax_rank = {}  # track best rank per normalized name
+    keepers = {}
+    pos_ids = {}
     with open(FANTRAX_FILE, 'r') as f:
-        reader = csv.DictReader(f)
+        # ~10k rows but only four columns are used, so read rows positionally
+        reader = csv.reader(f)
+        header = next(reader)
+        player_idx = header.index('Player')
+        position_idx = header.index('Position')
+        rank_idx = header.index('RkOv')
+        status_idx = header.index('Status')
         for row in reader:
-            n = normalize(row['Player'])
+            if not row:
+                continue
+            player = row[player_idx]
+            position = row[position_idx]
+            status = row[status_idx]
+            n = normalize(player)
             try:
-                rank = int(row['RkOv'])
-            except (ValueError, KeyError):
+                rank = int(row[rank_idx])
+            except ValueError:
                 rank = 99999
             # Keep the highest-ranked (lowest number) entry for each name
-            if n not in fantrax or rank < fantrax_rank.get(n, 99999):
+            best = fantrax_rank.get(n)
+            if best is None or rank < best:
                 fantrax[n] = {
-                    'original_name': row['Player'],
-                    'position': row['Position'],
-                    'status': row['Status']
+                    'original_name': player,
+                    'position': position,
+                    'status': status
                 }
                 fantrax_rank[n] = rank
+            if status != 'FA':
+                add_keeper(keepers, pos_ids, player, position, status, all_proj_names)
     # Special case: "Shohei Ohtani" in projections is the hitter ("Shohei Ohtani-H" in Fantrax)
     ohtani_h = fantrax.get(normalize('Shohei Ohtani-H'))
     if ohtani_h:
         fantrax[normalize('Shohei Ohtani')] = ohtani_h
-    return fantrax
+    return fantrax, keepers, list(pos_ids)
+
+
+def dumps_compact(obj):
+    """Serialize obj as compact JSON with non-ASCII left unescaped, via orjson when installed.
+
+    The two paths are not interchangeable in general: float formatting differs
+    (orjson writes 1e-05 as 0.00001 and 1e16 as 1e16, json as 1e-05 and 1e+16),
+    orjson writes NaN/Infinity as null, and it rejects non-str keys and
+    integers wider than 64 bits. On the current payloads (the four projection
+    arrays, POSITIONS, KEEPERS and POS_TABLE) they produce identical text.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
 
 
-def extract_json_array(content, prefix):
-    """Extract a JSON array from the HTML given a variable assignment prefix."""
-    idx = content.find(prefix)
-    if idx == -1:
-        raise ValueError(f"Could not find '{prefix}' in HTML")
+def find_offsets(content, prefixes):
+    """Locate each variable assignment prefix in the HTML once, up front."""
+    offsets = {}
+    for prefix in prefixes:
+        idx = content.find(prefix)
+        if idx == -1:
+            raise ValueError(f"Could not find '{prefix}' in HTML")
+        offsets[prefix] = idx
+    return offsets
+
+
+def extract_json_array(content, idx):
+    """Extract the JSON array that follows offset idx in the HTML.
+
+    raw_decode parses the array and reports where it ends in one pass,
+    so there is no separate scan for the closing bracket.
+    """
     start = content.find('[', idx)
-    depth = 0
-    end = start
-    for i, c in enumerate(content[start:], start):
-        if c == '[':
-            depth += 1
-        elif c == ']':
-            depth -= 1
-        if depth == 0:
-            end = i + 1
-            break
-    return json.loads(content[start:end]), start, end
-
-
-def add_positions_to_hitters(content, fantrax):
-    """Add 'pos' field to all three hitter arrays."""
-    for prefix in ['HITTERS_THEBAT = [', 'HITTERS_BATX = [', 'HITTERS_DC = [']:
-        arr, start, end = extract_json_array(content, prefix)
+    arr, end = _JSON_DECODER.raw_decode(content, start)
+    return arr, start, end
+
+
+def find_block(content, block):
+    """Return (start, end) of a block, from its start marker through its end marker."""
+    start_marker, end_marker = block
+    start = content.find(start_marker)
+    if start == -1:
+        raise ValueError(f"Could not find '{start_marker}' in HTML")
+    end = content.find(end_marker, start + len(start_marker))
+    if end == -1:
+        raise ValueError(f"Could not find '{end_marker}' after '{start_marker}' in HTML")
+    return start, end + len(end_marker)
+
+
+def apply_patches(content, patches):
+    """Stitch (start, end, replacement) patches into content in a single pass.
+
+    Patches are given in the coordinates of the original buffer and must not overlap.
+    """
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(patches):
+        if start < pos:
+            raise ValueError(f"Overlapping patch at offset {start}")
+        parts.append(content[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
+
+
+def add_positions_to_hitters(content, arrays, fantrax):
+    """
+    Emit one POSITIONS lookup { name: [positions] } shared by all three hitter arrays.
+    Returns a list of patches.
+
+    The draft tool copies POSITIONS[name] onto each hitter as 'pos' when the page
+    loads, so the arrays themselves are only rewritten to drop stale 'pos' fields.
+    HTML without a POSITIONS block gets one, plus the copy loop, after the last
+    hitter array.
+    """
+    positions = {}
+    patches = []
+    for prefix in HITTER_PREFIXES:
+        arr, start, end = arrays[prefix]
         matched = 0
+        stale = False
         for h in arr:
+            if h.pop('pos', None) is not None:
+                stale = True
             n = normalize(h['name'])
             if n in fantrax:
-                h['pos'] = fantrax[n]['position'].split(',')
+                positions[h['name']] = fantrax[n]['position'].split(',')
                 matched += 1
-            else:
-                h['pos'] = []
         print(f"  {prefix.split('=')[0].strip()}: matched {matched}/{len(arr)}")
-        new_json = json.dumps(arr, separators=(',', ':'))
-        content = content[:start] + new_json + content[end:]
-    return content
-
-
-def add_positions_to_pitchers(content, fantrax):
-    """Add 'pos' field to pitchers with dual SP/RP eligibility."""
-    arr, start, end = extract_json_array(content, 'const PITCHERS = [')
+        # Arrays patched before POSITIONS existed still carry a per-player 'pos' field
+        if stale:
+            new_json = dumps_compact(arr)
+            patches.append((start, end, new_json))
+    positions_js = f"const POSITIONS = {dumps_compact(positions)};"
+    if POSITIONS_BLOCK[0] in content:
+        start, end = find_block(content, POSITIONS_BLOCK)
+        patches.append((start, end, positions_js))
+    else:
+        last_end = max(arrays[prefix][2] for prefix in HITTER_PREFIXES)
+        insert_at = content.index(';', last_end) + 1
+        patches.append((insert_at, insert_at, f"\n{POSITIONS_COMMENT}    {positions_js}\n{POSITIONS_COPY}"))
+    return patches
+
+
+def add_positions_to_pitchers(arrays, fantrax):
+    """Add 'pos' field to the parsed pitchers with dual SP/RP eligibility. Returns a list of patches."""
+    arr, start, end = arrays[PITCHER_PREFIX]
     matched = 0
     for p in arr:
         n = normalize(p['name'])
@@ -116,73 +258,43 @@ def add_positions_to_pitchers(content, fantrax):
                 p['dualEligible'] = True
             matched += 1
     print(f"  PITCHERS: matched {matched}/{len(arr)}")
-    new_json = json.dumps(arr, separators=(',', ':'))
-    content = content[:start] + new_json + content[end:]
-    return content
-
-
-def build_keepers(fantrax, all_proj_names):
-    """
-    Build keepers dict: { teamName: [ {name, type, position?}, ... ] }
-    Uses projection names (with accents) so they match the embedded data.
-    """
-    keepers = {}
-    with open(FANTRAX_FILE, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row['Status'] == 'FA':
-                continue
-            team = row['Status']
-            if team not in keepers:
-                keepers[team] = []
-
-            fx_name = row['Player']
-            pos = row['Position']
-            positions = pos.split(',')
-            has_batting = any(p in ('C', '1B', '2B', '3B', 'SS', 'LF', 'CF', 'RF', 'UT') for p in positions)
-            has_pitching = any(p in ('SP', 'RP') for p in positions)
-
-            # Resolve to projection name
-            n = normalize(fx_name)
-            proj_name = all_proj_names.get(n)
-            if not proj_name:
-                # Special case Ohtani hitter
-                if fx_name == 'Shohei Ohtani-H':
-                    proj_name = all_proj_names.get(normalize('Shohei Ohtani'))
-                if not proj_name:
-                    print(f"  WARNING: Keeper '{fx_name}' ({team}) not found in projections, skipping")
-                    continue
-
-            if has_pitching and not has_batting:
-                ptype = 'SP' if 'SP' in positions else 'RP'
-                keepers[team].append({'name': proj_name, 'type': ptype})
-            else:
-                keepers[team].append({'name': proj_name, 'type': 'H', 'position': pos})
-
-    return keepers
+    new_json = dumps_compact(arr)
+    return [(start, end, new_json)]
 
 
 def update_team_names(content):
-    """Replace TEAM_NAMES array with Fantrax team names."""
-    old_pattern = r"const TEAM_NAMES = \[.*?\];"
+    """Replace TEAM_NAMES array with Fantrax team names. Returns a list of patches."""
+    start, end = find_block(content, TEAM_NAMES_BLOCK)
     new_value = f"const TEAM_NAMES = {json.dumps(FANTRAX_TEAMS)};"
-    content = re.sub(old_pattern, new_value, content)
-    return content
+    return [(start, end, new_value)]
 
 
-def update_my_team_references(content):
-    """Replace 'My Team' references with the Fantrax team name."""
-    content = content.replace("'My Team'", f"'{MY_TEAM}'")
-    content = content.replace('"My Team"', f'"{MY_TEAM}"')
-    return content
+def update_my_team_references(content, patches):
+    """Replace 'My Team' references with the Fantrax team name. Returns a list of patches.
 
+    References inside spans that other patches already replace are skipped,
+    since those blocks are regenerated wholesale.
+    """
+    replaced = [(start, end) for start, end, _ in patches]
+    new_patches = []
+    for m in _MY_TEAM_RE.finditer(content):
+        if not any(start <= m.start() < end for start, end in replaced):
+            quote = m.group(1)
+            new_patches.append((m.start(), m.end(), f"{quote}{MY_TEAM}{quote}"))
+    return new_patches
 
-def embed_keepers(content, keepers_data):
-    """Replace the initKeepers() function with one that loads all teams' keepers."""
-    keepers_json = json.dumps(keepers_data, ensure_ascii=False, separators=(',', ':'))
+
+def embed_keepers(content, keepers_data, pos_table):
+    """Replace the initKeepers() function with one that loads all teams' keepers. Returns a list of patches."""
+    keepers_json = dumps_compact(keepers_data)
+    pos_table_json = dumps_compact(pos_table)
 
     new_init = f"""(function initKeepers() {{
+        const POS_TABLE = {pos_table_json};
         const KEEPERS = {keepers_json};
+        // Reversed so the first entry wins on duplicate names (e.g. two Max Muncys), as Array.find did
+        const hitterByName = new Map(getHitters().map(h => [h.name, h]).reverse());
+        const pitcherByName = new Map(PITCHERS.map(p => [p.name, p]).reverse());
 
         Object.entries(KEEPERS).forEach(([teamName, keepers]) => {{
             const team = allTeams[teamName];
@@ -190,10 +302,10 @@ def embed_keepers(content, keepers_data):
 
             keepers.forEach(keeper => {{
                 if (keeper.type === 'H') {{
-                    const player = getHitters().find(h => h.name === keeper.name);
+                    const player = hitterByName.get(keeper.name);
                     if (player) {{
                         // Try to place in a matching position slot
-                        const eligiblePositions = keeper.position ? keeper.position.split(',') : [];
+                        const eligiblePositions = keeper.pos != null ? POS_TABLE[keeper.pos].split(',') : [];
                         let slotIdx = -1;
                         for (const pos of eligiblePositions) {{
                             slotIdx = team.hitters.findIndex(s => s.position === pos && s.player === null);
@@ -214,7 +326,7 @@ def embed_keepers(content, keepers_data):
                         }}
                     }}
                 }} else if (keeper.type === 'SP') {{
-                    const player = PITCHERS.find(p => p.name === keeper.name);
+                    const player = pitcherByName.get(keeper.name);
                     if (player) {{
                         const slotIdx = team.sps.findIndex(s => s === null);
                         if (slotIdx !== -1) {{
@@ -224,7 +336,7 @@ def embed_keepers(content, keepers_data):
                         }}
                     }}
                 }} else if (keeper.type === 'RP') {{
-                    const player = PITCHERS.find(p => p.name === keeper.name);
+                    const player = pitcherByName.get(keeper.name);
                     if (player) {{
                         const slotIdx = team.rps.findIndex(s => s === null);
                         if (slotIdx !== -1) {{
@@ -239,50 +351,51 @@ def embed_keepers(content, keepers_data):
     }})();"""
 
     # Replace the old initKeepers block
-    pattern = r'\(function initKeepers\(\) \{.*?\}\)\(\);'
-    content = re.sub(pattern, new_init, content, flags=re.DOTALL)
-    return content
+    start, end = find_block(content, INIT_KEEPERS_BLOCK)
+    return [(start, end, new_init)]
 
 
 def main():
-    print("Loading Fantrax data...")
-    fantrax = load_fantrax()
-    print(f"  Loaded {len(fantrax)} Fantrax entries")
-
-    print("\nReading draft_tool.html...")
+    print("Reading draft_tool.html...")
     with open(HTML_FILE, 'r') as f:
         content = f.read()
+    offsets = find_offsets(content, HITTER_PREFIXES + [PITCHER_PREFIX])
+
+    # Parse each embedded array exactly once; later passes mutate these in place
+    arrays = {prefix: extract_json_array(content, idx) for prefix, idx in offsets.items()}
 
     # Build projection name lookup from all hitter/pitcher arrays
     all_proj_names = {}
-    for prefix in ['HITTERS_THEBAT = [', 'HITTERS_BATX = [', 'HITTERS_DC = [']:
-        arr, _, _ = extract_json_array(content, prefix)
-        for h in arr:
-            all_proj_names[normalize(h['name'])] = h['name']
-    arr, _, _ = extract_json_array(content, 'const PITCHERS = [')
-    for p in arr:
-        all_proj_names[normalize(p['name'])] = p['name']
+    for arr, _, _ in arrays.values():
+        for player in arr:
+            all_proj_names[normalize(player['name'])] = player['name']
     # Ohtani special case
     all_proj_names[normalize('Shohei Ohtani-H')] = all_proj_names.get(normalize('Shohei Ohtani'), 'Shohei Ohtani')
 
+    print("\nLoading Fantrax data and keepers...")
+    fantrax, keepers_data, pos_table = parse_fantrax(all_proj_names)
+    print(f"  Loaded {len(fantrax)} Fantrax entries")
+
     print("\nAdding positional eligibility to hitters...")
-    content = add_positions_to_hitters(content, fantrax)
+    patches = add_positions_to_hitters(content, arrays, fantrax)
 
     print("\nAdding dual eligibility to pitchers...")
-    content = add_positions_to_pitchers(content, fantrax)
+    patches += add_positions_to_pitchers(arrays, fantrax)
 
-    print("\nBuilding keepers...")
-    keepers_data = build_keepers(fantrax, all_proj_names)
+    print("\nKeepers:")
     for team in sorted(keepers_data):
         names = [k['name'] for k in keepers_data[team]]
         print(f"  {team} ({len(names)}): {names}")
 
     print("\nUpdating team names...")
-    content = update_team_names(content)
-    content = update_my_team_references(content)
+    patches += update_team_names(content)
 
     print("\nEmbedding keepers initialization...")
-    content = embed_keepers(content, keepers_data)
+    patches += embed_keepers(content, keepers_data, pos_table)
+    patches += update_my_team_references(content, patches)
+
+    # Every edit is in the original document's coordinates; stitch them in one pass
+    content = apply_patches(content, patches)
 
     print("\nWriting updated draft_tool.html...")
     with open(HTML_FILE, 'w') as f:
@@ -1,6 +1,8 @@
 import csv
 import sys
 
+from name_utils import normalize
+
 # Read the raw data and create a clean CSV with only relevant fantasy categories
 # Can be overridden via command line: python create_league_stats.py <input_file> <output_file>
 if len(sys.argv) >= 3:
@@ -16,14 +18,20 @@ MIN_PA = 200
 DC_FILE = '/home/user/FBB/Depth_Charts_March_26.csv'
 
 # Build set of eligible players (those with >= MIN_PA in Depth Charts)
+# Only the Name and PA columns are needed, so read rows positionally.
+# Names are normalized so an accent or punctuation difference between
+# projection systems doesn't silently drop a player.
 eligible_players = set()
 with open(DC_FILE, 'r', encoding='utf-8-sig') as f:
-    reader = csv.DictReader(f)
+    reader = csv.reader(f)
+    header = next(reader)
+    name_idx = header.index('Name')
+    pa_idx = header.index('PA')
     for row in reader:
         try:
-            if float(row['PA']) >= MIN_PA:
-                eligible_players.add(row['Name'])
-        except (ValueError, KeyError):
+            if float(row[pa_idx]) >= MIN_PA:
+                eligible_players.add(normalize(row[name_idx]))
+        except (ValueError, IndexError):
             pass
 print(f"Loaded {len(eligible_players)} eligible players with >= {MIN_PA} PA from Depth Charts")
 
@@ -42,6 +50,16 @@ AVG_OBP = 0.327
 # Number of weeks in season
 NUM_WEEKS = 25
 
+# Reciprocal z-score scales, so each z-score is one multiply instead of two divides
+# Counting stats: 1 / (NUM_WEEKS * SD); OBP: 1 / (9 * SD_OBP)
+INV_R = 1 / (NUM_WEEKS * SD_R)
+INV_HR = 1 / (NUM_WEEKS * SD_HR)
+INV_RBI = 1 / (NUM_WEEKS * SD_RBI)
+INV_SB = 1 / (NUM_WEEKS * SD_SB)
+INV_SO = 1 / (NUM_WEEKS * SD_SO)
+INV_TB = 1 / (NUM_WEEKS * SD_TB)
+INV_OBP9 = 1 / (9 * SD_OBP)
+
 # Target PA - all players supplemented to this level with replacement production
 # NOTE: This is the SINGLE SOURCE OF TRUTH for PA normalization.
 # Do NOT add PA normalization in draft_tool.html - it happens here at data generation time.
@@ -69,101 +87,102 @@ REP_TB_PER_PA = 0.372522   # 3834 TB / 10292 PA
 REP_SB_PER_PA = 0.015157   # 156 SB / 10292 PA
 REP_OBP = 0.324            # Actual cohort average OBP (ranks 155-175)
 
+# Output columns; each output row is a tuple in this order
+fieldnames = ['Name', 'PA', 'R', 'HR', 'RBI', 'SO', 'TB', 'SB', 'OBP',
+              'zR', 'zHR', 'zRBI', 'zSO', 'zTB', 'zSB', 'zOBP', 'zTotal']
+ZTOTAL_IDX = fieldnames.index('zTotal')
+
 with open(input_file, 'r', encoding='utf-8-sig') as infile:
-    reader = csv.DictReader(infile)
+    reader = csv.reader(infile)
+    ix = {col: i for i, col in enumerate(next(reader))}
 
     # Prepare output data
     output_rows = []
 
+    # Resolve the needed columns once; a missing column fails here rather than on every row
+    name_idx = ix['Name']
+    stat_idx = [ix[col] for col in ('PA', 'K%', '1B', '2B', '3B', 'HR', 'R', 'RBI', 'SB', 'OBP')]
+
     for row in reader:
+        if not row:
+            continue  # blank line
+
+        # Skip players not in eligible pool (< MIN_PA in Depth Charts)
+        name = row[name_idx]
+        if normalize(name) not in eligible_players:
+            continue
+
+        # Only the numeric parse can fail; the math below runs outside the handler
         try:
-            # Extract raw values
-            name = row['Name']
-
-            # Skip players not in eligible pool (< MIN_PA in Depth Charts)
-            if name not in eligible_players:
-                continue
-
-            pa = float(row['PA'])
-            k_pct = float(row['K%'])
-            singles = float(row['1B'])
-            doubles = float(row['2B'])
-            triples = float(row['3B'])
-            hr = float(row['HR'])
-            runs = float(row['R'])
-            rbi = float(row['RBI'])
-            sb = float(row['SB'])
-            obp = float(row['OBP'])
-
-            # Calculate Strikeouts: K% * PA
-            strikeouts = k_pct * pa
-
-            # Calculate Total Bases: 1B + 2*2B + 3*3B + 4*HR
-            total_bases = singles + (2 * doubles) + (3 * triples) + (4 * hr)
-
-            # Supplement low-PA players with replacement-level production
-            if pa < TARGET_PA:
-                gap_pa = TARGET_PA - pa
-                runs = runs + gap_pa * REP_R_PER_PA
-                hr = hr + gap_pa * REP_HR_PER_PA
-                rbi = rbi + gap_pa * REP_RBI_PER_PA
-                strikeouts = strikeouts + gap_pa * REP_SO_PER_PA
-                total_bases = total_bases + gap_pa * REP_TB_PER_PA
-                sb = sb + gap_pa * REP_SB_PER_PA
-                # OBP is weighted average
-                obp = (pa * obp + gap_pa * REP_OBP) / TARGET_PA
-                pa = TARGET_PA
-
-            # Calculate z-scores
-            # Counting stats: (season_stat / NUM_WEEKS) / SD
-            z_r = (runs / NUM_WEEKS) / SD_R
-            z_hr = (hr / NUM_WEEKS) / SD_HR
-            z_rbi = (rbi / NUM_WEEKS) / SD_RBI
-            z_sb = (sb / NUM_WEEKS) / SD_SB
-            z_tb = (total_bases / NUM_WEEKS) / SD_TB
-
-            # Strikeouts: negative because lower is better
-            z_so = -(strikeouts / NUM_WEEKS) / SD_SO
-
-            # OBP: (player_OBP - avg_OBP) / 9 / SD_OBP
-            z_obp = (obp - AVG_OBP) / 9 / SD_OBP
-
-            # Total z-score
-            z_total = z_r + z_hr + z_rbi + z_sb + z_tb + z_so + z_obp
-
-            output_rows.append({
-                'Name': name,
-                'PA': round(pa),
-                'R': round(runs),
-                'HR': round(hr),
-                'RBI': round(rbi),
-                'SO': round(strikeouts),
-                'TB': round(total_bases),
-                'SB': round(sb),
-                'OBP': round(obp, 3),
-                'zR': round(z_r, 2),
-                'zHR': round(z_hr, 2),
-                'zRBI': round(z_rbi, 2),
-                'zSO': round(z_so, 2),
-                'zTB': round(z_tb, 2),
-                'zSB': round(z_sb, 2),
-                'zOBP': round(z_obp, 2),
-                'zTotal': round(z_total, 2)
-            })
-        except (ValueError, KeyError) as e:
+            pa, k_pct, singles, doubles, triples, hr, runs, rbi, sb, obp = [float(row[i]) for i in stat_idx]
+        except (ValueError, IndexError) as e:
             # Skip rows with missing/invalid data
             print(f"Skipping row due to error: {e}")
             continue
 
+        # Calculate Strikeouts: K% * PA
+        strikeouts = k_pct * pa
+
+        # Calculate Total Bases: 1B + 2*2B + 3*3B + 4*HR
+        total_bases = singles + (2 * doubles) + (3 * triples) + (4 * hr)
+
+        # Supplement low-PA players with replacement-level production
+        if pa < TARGET_PA:
+            gap_pa = TARGET_PA - pa
+            runs = runs + gap_pa * REP_R_PER_PA
+            hr = hr + gap_pa * REP_HR_PER_PA
+            rbi = rbi + gap_pa * REP_RBI_PER_PA
+            strikeouts = strikeouts + gap_pa * REP_SO_PER_PA
+            total_bases = total_bases + gap_pa * REP_TB_PER_PA
+            sb = sb + gap_pa * REP_SB_PER_PA
+            # OBP is weighted average
+            obp = (pa * obp + gap_pa * REP_OBP) / TARGET_PA
+            pa = TARGET_PA
+
+        # Calculate z-scores
+        # Counting stats: (season_stat / NUM_WEEKS) / SD
+        z_r = runs * INV_R
+        z_hr = hr * INV_HR
+        z_rbi = rbi * INV_RBI
+        z_sb = sb * INV_SB
+        z_tb = total_bases * INV_TB
+
+        # Strikeouts: negative because lower is better
+        z_so = -strikeouts * INV_SO
+
+        # OBP: (player_OBP - avg_OBP) / 9 / SD_OBP
+        z_obp = (obp - AVG_OBP) * INV_OBP9
+
+        # Total z-score
+        z_total = z_r + z_hr + z_rbi + z_sb + z_tb + z_so + z_obp
+
+        output_rows.append((
+            name,
+            round(pa),
+            round(runs),
+            round(hr),
+            round(rbi),
+            round(strikeouts),
+            round(total_bases),
+            round(sb),
+            round(obp, 3),
+            round(z_r, 2),
+            round(z_hr, 2),
+            round(z_rbi, 2),
+            round(z_so, 2),
+            round(z_tb, 2),
+            round(z_sb, 2),
+            round(z_obp, 2),
+            round(z_total, 2)
+        ))
+
 # Sort by total z-score descending (best players first)
-output_rows.sort(key=lambda x: x['zTotal'], reverse=True)
+output_rows.sort(key=lambda x: x[ZTOTAL_IDX], reverse=True)
 
 # Write output CSV
-fieldnames = ['Name', 'PA', 'R', 'HR', 'RBI', 'SO', 'TB', 'SB', 'OBP',
-              'zR', 'zHR', 'zRBI', 'zSO', 'zTB', 'zSB', 'zOBP', 'zTotal']
 with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-    writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-    writer.writeheader()
+    writer = csv.writer(outfile)
+    writer.writerow(fieldnames)
     writer.writerows(output_rows)
 
 print(f"Created {output_file} with {len(output_rows)} players")
@@ -171,4 +190,5 @@ print("\nTop 15 players by total z-score:")
 print(f"{'Name':<25} {'zR':>5} {'zHR':>5} {'zRBI':>5} {'zSO':>5} {'zTB':>5} {'zSB':>5} {'zOBP':>5} {'zTot':>6}")
 print("-" * 80)
 for row in output_rows[:15]:
+    row = dict(zip(fieldnames, row))
     print(f"{row['Name']:<25} {row['zR']:>5} {row['zHR']:>5} {row['zRBI']:>5} {row['zSO']:>5} {row['zTB']:>5} {row['zSB']:>5} {row['zOBP']:>5} {row['zTotal']:>6}")
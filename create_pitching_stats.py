@@ -1,4 +1,5 @@
 import csv
+from operator import itemgetter
 
 # Read the pitching data and create a clean CSV for fantasy purposes
 input_file = '/home/user/FBB/ATC_Jan_26_Pitching.csv'
@@ -55,34 +56,31 @@ REP_RP_WH_PER_WK = 2.852  # Walks + Hits
 AVG_ERA = 3.7929
 AVG_WHIP = 1.2048
 
+# Numeric columns read per pitcher, in the order they are unpacked below
+STAT_COLS = ('GS', 'G', 'IP', 'L', 'SV', 'HLD', 'QS', 'SO', 'ER', 'H', 'BB', 'ERA', 'WHIP')
+
 with open(input_file, 'r', encoding='utf-8-sig') as infile:
-    reader = csv.DictReader(infile)
+    reader = csv.reader(infile)
+    col_idx = {col: i for i, col in enumerate(next(reader))}
+    name_idx = col_idx['Name']
+    war_idx = col_idx['WAR']
+    stat_values = itemgetter(*(col_idx[col] for col in STAT_COLS))
 
     sp_rows = []
     rp_rows = []
 
     for row in reader:
+        if not row:
+            continue
         try:
-            name = row['Name'].strip('"')
-            war = float(row['WAR'])
+            name = row[name_idx].strip('"')
+            war = float(row[war_idx])
 
             # Skip low-WAR players
             if war < MIN_WAR:
                 continue
 
-            gs = float(row['GS'])
-            g = float(row['G'])
-            ip = float(row['IP'])
-            l = float(row['L'])
-            sv = float(row['SV'])
-            hld = float(row['HLD'])
-            qs = float(row['QS'])
-            k = float(row['SO'])
-            er = float(row['ER'])
-            h = float(row['H'])
-            bb = float(row['BB'])
-            era = float(row['ERA'])
-            whip = float(row['WHIP'])
+            gs, g, ip, l, sv, hld, qs, k, er, h, bb, era, whip = map(float, stat_values(row))
 
             # Classify as SP or RP based on GS ratio
             # SP if they have meaningful starts (GS > 5)
@@ -108,21 +106,16 @@ with open(input_file, 'r', encoding='utf-8-sig') as infile:
                     wh = wh + gap_gs * (REP_SP_H_PER_GS + REP_SP_BB_PER_GS)
                     gs = gs + gap_gs
 
-                # Per-start rates from (possibly supplemented) totals
-                ip_per_gs = ip / gs
-                l_per_gs = l / gs
-                qs_per_gs = qs / gs
-                k_per_gs = k / gs
-                er_per_gs = er / gs
-                wh_per_gs = wh / gs
-
-                # Weekly stats (1.1 starts)
-                ip_wk = ip_per_gs * SP_CONTRIBUTION
-                l_wk = l_per_gs * SP_CONTRIBUTION
-                qs_wk = qs_per_gs * SP_CONTRIBUTION
-                k_wk = k_per_gs * SP_CONTRIBUTION
-                er_wk = er_per_gs * SP_CONTRIBUTION
-                wh_wk = wh_per_gs * SP_CONTRIBUTION
+                # Weekly stats (1.1 starts) from per-start rates of the
+                # (possibly supplemented) totals: stat / gs * SP_CONTRIBUTION,
+                # folded into one scale factor per pitcher
+                wk_scale = SP_CONTRIBUTION / gs
+                ip_wk = ip * wk_scale
+                l_wk = l * wk_scale
+                qs_wk = qs * wk_scale
+                k_wk = k * wk_scale
+                er_wk = er * wk_scale
+                wh_wk = wh * wk_scale
 
                 # ERA and WHIP from blended totals
                 player_era = er * 9 / ip
@@ -132,6 +125,7 @@ with open(input_file, 'r', encoding='utf-8-sig') as infile:
                     'Name': name,
                     'Type': 'SP',
                     'GS': round(orig_gs, 1),
+                    'G': '',  # RP-only column
                     'IP': round(orig_ip, 1),
                     'IP_wk': round(ip_wk, 2),
                     'L_wk': round(l_wk, 3),
@@ -158,6 +152,7 @@ with open(input_file, 'r', encoding='utf-8-sig') as infile:
                 rp_rows.append({
                     'Name': name,
                     'Type': 'RP',
+                    'GS': '',  # SP-only column
                     'G': round(g, 1),
                     'IP': round(ip, 1),
                     'IP_wk': round(ip_wk, 2),
@@ -173,25 +168,22 @@ with open(input_file, 'r', encoding='utf-8-sig') as infile:
                     'WAR': round(war, 2)
                 })
 
-        except (ValueError, KeyError) as e:
+        except (ValueError, IndexError) as e:
             continue
 
 # Combine and sort by WAR descending
+by_war = itemgetter('WAR')
 all_pitchers = sp_rows + rp_rows
-all_pitchers.sort(key=lambda x: x['WAR'], reverse=True)
+all_pitchers.sort(key=by_war, reverse=True)
 
-# Write output CSV
+# Write output CSV (every row carries every column, so pull values
+# positionally instead of going through DictWriter per row)
 fieldnames = ['Name', 'Type', 'GS', 'G', 'IP', 'IP_wk', 'L_wk', 'SV_wk', 'HLD_wk', 'K_wk', 'QS_wk', 'ER_wk', 'WH_wk', 'ERA', 'WHIP', 'WAR']
+row_values = itemgetter(*fieldnames)
 with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-    writer = csv.DictWriter(outfile, fieldnames=fieldnames, extrasaction='ignore')
-    writer.writeheader()
-    for row in all_pitchers:
-        # Fill in missing G/GS columns
-        if 'G' not in row:
-            row['G'] = ''
-        if 'GS' not in row:
-            row['GS'] = ''
-        writer.writerow(row)
+    writer = csv.writer(outfile)
+    writer.writerow(fieldnames)
+    writer.writerows(map(row_values, all_pitchers))
 
 print(f"Created {output_file}")
 print(f"  SPs: {len(sp_rows)} (WAR >= {MIN_WAR})")
@@ -201,13 +193,13 @@ print(f"  Total: {len(all_pitchers)}")
 print(f"\nTop 15 SPs by WAR (supplemented to {TARGET_SP_IP} IP):")
 print(f"{'Name':<25} {'IP':>5} {'IP_wk':>6} {'L_wk':>5} {'K_wk':>5} {'QS_wk':>5} {'ERA':>5} {'WHIP':>5}")
 print("-" * 70)
-for row in sorted(sp_rows, key=lambda x: x['WAR'], reverse=True)[:15]:
+for row in sorted(sp_rows, key=by_war, reverse=True)[:15]:
     print(f"{row['Name']:<25} {row['IP']:>5} {row['IP_wk']:>6} {row['L_wk']:>5} {row['K_wk']:>5} {row['QS_wk']:>5} {row['ERA']:>5} {row['WHIP']:>5}")
 
 print("\nTop 15 RPs by WAR:")
 print(f"{'Name':<25} {'G':>5} {'IP_wk':>6} {'SV_wk':>5} {'HLD_wk':>5} {'K_wk':>5} {'ERA':>5} {'WHIP':>5}")
 print("-" * 70)
-for row in sorted(rp_rows, key=lambda x: x['WAR'], reverse=True)[:15]:
+for row in sorted(rp_rows, key=by_war, reverse=True)[:15]:
     print(f"{row['Name']:<25} {row.get('G', 0):>5} {row['IP_wk']:>6} {row['SV_wk']:>5} {row['HLD_wk']:>5} {row['K_wk']:>5} {row['ERA']:>5} {row['WHIP']:>5}")
 
 # Print replacement level weekly stats
@@ -7,7 +7,9 @@ Updates rankings dynamically as players are drafted.
 """
 
 import csv
+import heapq
 import math
+from itertools import islice
 from typing import List, Dict, Optional
 
 # =============================================================================
@@ -56,30 +58,59 @@ REPLACEMENT_LEVEL = {
 # Categories where lower is better
 NEGATIVE_CATS = {'SO'}
 
+# Category order for per-player and per-team stat vectors
+CATS = ('R', 'HR', 'RBI', 'SB', 'SO', 'TB', 'OBP')
+CAT_IDX = {cat: i for i, cat in enumerate(CATS)}
+OBP_IDX = CAT_IDX['OBP']
+
+# Per-category constants in CATS order for the ranking kernel
+LG_AVG = tuple(LEAGUE_AVG_WEEKLY[cat] for cat in CATS)
+# +1 where higher is better, -1 where lower is better (SO)
+SIGN = tuple(-1.0 if cat in NEGATIVE_CATS else 1.0 for cat in CATS)
+
 # =============================================================================
 # MATH HELPERS
 # =============================================================================
 
-def normal_cdf(x: float) -> float:
-    """Standard normal CDF using error function approximation."""
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+SQRT2 = math.sqrt(2)
+INV_SQRT2 = 1 / SQRT2
 
+# Per-category sd * √2, the denominator of the win-probability z-score
+SD_SQRT2 = tuple(WEEKLY_SD[cat] * SQRT2 for cat in CATS)
 
-def win_probability(my_mean: float, opp_mean: float, sd: float, lower_is_better: bool = False) -> float:
-    """
-    Calculate probability of winning a category.
 
-    Assumes both teams' weekly totals are normally distributed with the same SD.
-    P(my > opp) = Φ((my_mean - opp_mean) / (sd * √2))
+def _category_kernel(deltas: List[List[float]], base: List[float]) -> List[List[float]]:
+    """
+    Per-category P(win), indexed like CATS, for each projection delta on top
+    of the base team projections.
 
-    For categories where lower is better (like SO):
-    P(my < opp) = Φ((opp_mean - my_mean) / (sd * √2))
+    P(win) = Φ(sign * (my_mean - lg_avg) / (sd * √2)): both teams' weekly totals
+    are normal with the same SD, and SIGN flips lower-is-better categories.
+    This is the one place the formula lives; it is inlined so the loop over
+    candidates makes no Python calls besides math.erf.
     """
-    if lower_is_better:
-        z = (opp_mean - my_mean) / (sd * math.sqrt(2))
-    else:
-        z = (my_mean - opp_mean) / (sd * math.sqrt(2))
-    return normal_cdf(z)
+    erf = math.erf
+    inv_sqrt2 = INV_SQRT2
+    consts = list(zip(base, LG_AVG, SD_SQRT2, SIGN))
+    return [
+        [0.5 * (1 + erf(sign * (b + d - lg) / sd_sqrt2 * inv_sqrt2))
+         for d, (b, lg, sd_sqrt2, sign) in zip(delta, consts)]
+        for delta in deltas
+    ]
+
+
+def _rank_kernel(deltas: List[List[float]], base: List[float], base_total: float) -> List[float]:
+    """Marginal value (change in total expected wins) of each projection delta against the base team projections."""
+    return [sum(row) - base_total for row in _category_kernel(deltas, base)]
+
+
+# A single all-zero delta: evaluates the base projections as they are
+NO_DELTA = ((0.0,) * len(CATS),)
+
+
+def expected_wins(projections: List[float]) -> List[float]:
+    """P(win) for each category, indexed like CATS, given weekly team projections."""
+    return _category_kernel(NO_DELTA, projections)[0]
 
 
 # =============================================================================
@@ -87,6 +118,10 @@ def win_probability(my_mean: float, opp_mean: float, sd: float, lower_is_better:
 # =============================================================================
 
 class Player:
+    # Fixed attribute set: no per-instance __dict__ for the ~300 loaded players
+    __slots__ = ('name', 'pa', 'r', 'hr', 'rbi', 'so', 'tb', 'sb', 'obp', 'z_total',
+                 'weekly')
+
     def __init__(self, data: Dict):
         self.name = data['Name']
         self.pa = int(data['PA'])
@@ -99,16 +134,16 @@ class Player:
         self.obp = float(data['OBP'])
         self.z_total = float(data['zTotal'])
 
-        # Weekly projections
-        self.weekly = {
-            'R': self.r / NUM_WEEKS,
-            'HR': self.hr / NUM_WEEKS,
-            'RBI': self.rbi / NUM_WEEKS,
-            'SB': self.sb / NUM_WEEKS,
-            'SO': self.so / NUM_WEEKS,
-            'TB': self.tb / NUM_WEEKS,
-            'OBP': self.obp
-        }
+        # Weekly projections, indexed like CATS (use CAT_IDX to look up by name)
+        self.weekly = (
+            self.r / NUM_WEEKS,
+            self.hr / NUM_WEEKS,
+            self.rbi / NUM_WEEKS,
+            self.sb / NUM_WEEKS,
+            self.so / NUM_WEEKS,
+            self.tb / NUM_WEEKS,
+            self.obp
+        )
 
     def __repr__(self):
         return f"Player({self.name})"
@@ -140,43 +175,38 @@ class Roster:
         self.num_spots = num_spots
         self.players: List[Player] = []
         self.replacement = create_replacement_player()
+        # Running sum of drafted players' weekly vectors, kept in step with self.players
+        self._sum = [0.0] * len(CATS)
 
     def add_player(self, player: Player):
         """Add a player to the roster."""
         if len(self.players) >= self.num_spots:
             raise ValueError("Roster is full!")
         self.players.append(player)
+        self._sum = [s + v for s, v in zip(self._sum, player.weekly)]
 
     def remove_player(self, player_name: str) -> Optional[Player]:
         """Remove a player from the roster by name."""
         for i, p in enumerate(self.players):
             if p.name == player_name:
-                return self.players.pop(i)
+                removed = self.players.pop(i)
+                self._sum = [s - v for s, v in zip(self._sum, removed.weekly)]
+                return removed
         return None
 
-    def get_weekly_projections(self) -> Dict[str, float]:
+    def get_weekly_projections(self) -> List[float]:
         """
-        Calculate team's weekly projections for each category.
+        Calculate team's weekly projections for each category, indexed like CATS.
 
         For counting stats: sum of all players' weekly contributions
         For OBP: average of all players' OBPs (simplified /9 model)
         """
         # Fill empty slots with replacement players
-        num_drafted = len(self.players)
-        num_replacement = self.num_spots - num_drafted
-
-        projections = {}
-
-        # Counting stats: sum weekly contributions
-        for cat in ['R', 'HR', 'RBI', 'SB', 'SO', 'TB']:
-            total = sum(p.weekly[cat] for p in self.players)
-            total += num_replacement * self.replacement.weekly[cat]
-            projections[cat] = total
+        num_replacement = self.num_spots - len(self.players)
+        projections = [s + num_replacement * r for s, r in zip(self._sum, self.replacement.weekly)]
 
         # OBP: average (simplified model)
-        obp_sum = sum(p.obp for p in self.players)
-        obp_sum += num_replacement * self.replacement.obp
-        projections['OBP'] = obp_sum / self.num_spots
+        projections[OBP_IDX] /= self.num_spots
 
         return projections
 
@@ -186,25 +216,23 @@ class Roster:
 
         Returns dict with P(win) for each category and total expected wins.
         """
-        projections = self.get_weekly_projections()
-
-        wins = {}
-        total = 0.0
-
-        for cat in ['R', 'HR', 'RBI', 'SB', 'SO', 'TB', 'OBP']:
-            lower_is_better = cat in NEGATIVE_CATS
-            p_win = win_probability(
-                my_mean=projections[cat],
-                opp_mean=LEAGUE_AVG_WEEKLY[cat],
-                sd=WEEKLY_SD[cat],
-                lower_is_better=lower_is_better
-            )
-            wins[cat] = p_win
-            total += p_win
-
-        wins['TOTAL'] = total
+        p_wins = expected_wins(self.get_weekly_projections())
+
+        wins = dict(zip(CATS, p_wins))
+        wins['TOTAL'] = sum(p_wins)
         return wins
 
+    def get_player_delta(self, player: Player) -> List[float]:
+        """
+        Change in weekly projections from filling one replacement slot with player.
+
+        Counting stats move by the difference in weekly totals; OBP by the
+        difference in OBP spread across the roster (simplified /9 model).
+        """
+        delta = [v - r for v, r in zip(player.weekly, self.replacement.weekly)]
+        delta[OBP_IDX] /= self.num_spots
+        return delta
+
     def get_roster_summary(self) -> str:
         """Return a formatted string summarizing the roster."""
         lines = []
@@ -231,7 +259,7 @@ class Roster:
         lines.append("-" * 70)
 
         for cat in ['R', 'HR', 'RBI', 'SO', 'TB', 'SB', 'OBP']:
-            my_val = proj[cat]
+            my_val = proj[CAT_IDX[cat]]
             lg_val = LEAGUE_AVG_WEEKLY[cat]
             p_win = wins[cat]
 
@@ -254,16 +282,26 @@ class Roster:
 class DraftTool:
     def __init__(self, players_file: str, top_n: int = 300):
         self.roster = Roster()
-        self.available: List[Player] = []
         self.drafted_names: set = set()
 
-        # Load players
+        # Load players (only the first top_n rows are read)
         with open(players_file, 'r') as f:
             reader = csv.DictReader(f)
-            for i, row in enumerate(reader):
-                if i >= top_n:
-                    break
-                self.available.append(Player(row))
+            self.available: List[Player] = [Player(row) for row in islice(reader, top_n)]
+
+        # Projection change each player brings, parallel to self.available
+        self._deltas = [self.roster.get_player_delta(p) for p in self.available]
+
+        # Lowercased names for search, and an exact-name index for draft/take.
+        # On duplicate names (e.g. two Max Muncys) the first listed player wins.
+        self._lower_names = [p.name.lower() for p in self.available]
+        self._by_lower: Dict[str, int] = {}
+        for i, lower in enumerate(self._lower_names):
+            self._by_lower.setdefault(lower, i)
+
+        # Still-available flag per player, parallel to self.available; kept
+        # in step with drafted_names so ranking never rescans the name set
+        self._alive = [True] * len(self.available)
 
         print(f"Loaded {len(self.available)} players")
 
@@ -276,29 +314,32 @@ class DraftTool:
         if len(self.roster.players) >= self.roster.num_spots:
             return 0.0
 
-        # Current expected wins
-        current_wins = self.roster.get_expected_wins()['TOTAL']
-
-        # Temporarily add player
-        self.roster.players.append(player)
-        new_wins = self.roster.get_expected_wins()['TOTAL']
-        self.roster.players.pop()
+        base = self.roster.get_weekly_projections()
+        return _rank_kernel([self.roster.get_player_delta(player)], base, sum(expected_wins(base)))[0]
 
-        return new_wins - current_wins
-
-    def get_ranked_available(self) -> List[tuple]:
+    def get_ranked_available(self, n: Optional[int] = None) -> List[tuple]:
         """
         Return available players ranked by marginal value.
 
+        The current roster is evaluated once; each candidate only adds its
+        precomputed projection delta on top of it. If n is given, only the
+        top n are selected (heap, no full sort).
+
         Returns list of (player, marginal_value) tuples.
         """
-        available = [p for p in self.available if p.name not in self.drafted_names]
+        candidates = [(p, d) for p, d, alive in zip(self.available, self._deltas, self._alive)
+                      if alive]
 
-        ranked = []
-        for player in available:
-            mv = self.calculate_marginal_value(player)
-            ranked.append((player, mv))
+        if len(self.roster.players) >= self.roster.num_spots:
+            mvs = [0.0] * len(candidates)
+        else:
+            base = self.roster.get_weekly_projections()
+            mvs = _rank_kernel([d for _, d in candidates], base, sum(expected_wins(base)))
 
+        ranked = [(p, mv) for (p, _), mv in zip(candidates, mvs)]
+
+        if n is not None:
+            return heapq.nlargest(n, ranked, key=lambda x: x[1])
         ranked.sort(key=lambda x: x[1], reverse=True)
         return ranked
 
@@ -308,40 +349,49 @@ class DraftTool:
 
         Returns True if successful, False if player not found or already drafted.
         """
-        for player in self.available:
-            if player.name.lower() == player_name.lower():
-                if player.name in self.drafted_names:
-                    print(f"  {player.name} has already been drafted!")
-                    return False
+        idx = self._by_lower.get(player_name.lower())
+        if idx is None:
+            print(f"  Player '{player_name}' not found in top 300")
+            return False
 
-                self.roster.add_player(player)
-                self.drafted_names.add(player.name)
-                print(f"  ✓ Drafted {player.name}")
-                return True
+        player = self.available[idx]
+        if player.name in self.drafted_names:
+            print(f"  {player.name} has already been drafted!")
+            return False
 
-        print(f"  Player '{player_name}' not found in top 300")
-        return False
+        self.roster.add_player(player)
+        self._remove_available(player)
+        print(f"  ✓ Drafted {player.name}")
+        return True
 
     def mark_drafted(self, player_name: str) -> bool:
         """
         Mark a player as drafted by another team (removes from available).
         """
-        for player in self.available:
-            if player.name.lower() == player_name.lower():
-                if player.name in self.drafted_names:
-                    print(f"  {player.name} has already been drafted!")
-                    return False
-
-                self.drafted_names.add(player.name)
-                print(f"  ✓ Marked {player.name} as drafted by opponent")
-                return True
-
-        print(f"  Player '{player_name}' not found in top 300")
-        return False
+        idx = self._by_lower.get(player_name.lower())
+        if idx is None:
+            print(f"  Player '{player_name}' not found in top 300")
+            return False
+
+        player = self.available[idx]
+        if player.name in self.drafted_names:
+            print(f"  {player.name} has already been drafted!")
+            return False
+
+        self._remove_available(player)
+        print(f"  ✓ Marked {player.name} as drafted by opponent")
+        return True
+
+    def _remove_available(self, player: Player):
+        """Record a player as drafted; every entry with that name drops out."""
+        self.drafted_names.add(player.name)
+        for i, p in enumerate(self.available):
+            if p.name == player.name:
+                self._alive[i] = False
 
     def show_top_available(self, n: int = 25):
         """Display top N available players by marginal value."""
-        ranked = self.get_ranked_available()[:n]
+        ranked = self.get_ranked_available(n)
 
         print("\n" + "=" * 90)
         print(f"TOP {n} AVAILABLE PLAYERS (by Marginal Value)")
@@ -358,7 +408,7 @@ class DraftTool:
 
     def show_category_values(self, n: int = 10):
         """Show top players for each category by marginal value contribution."""
-        ranked = self.get_ranked_available()
+        ranked = self.get_ranked_available(50)  # Check top 50 by total MV
 
         # For each category, show who would help most
         print("\n" + "=" * 70)
@@ -366,20 +416,20 @@ class DraftTool:
         print("=" * 70)
 
         current_proj = self.roster.get_weekly_projections()
-        current_wins = self.roster.get_expected_wins()
+        current_wins = expected_wins(current_proj)
+
+        # P(win) in every category with each player added, in one pass
+        players = [player for player, total_mv in ranked]
+        new_wins = _category_kernel([self.roster.get_player_delta(p) for p in players],
+                                    current_proj)
 
         for cat in ['R', 'HR', 'RBI', 'SO', 'TB', 'SB', 'OBP']:
-            print(f"\n{cat} (current P(win): {current_wins[cat]:.1%}):")
-
-            # Calculate category-specific value for each player
-            cat_values = []
-            for player, total_mv in ranked[:50]:  # Check top 50 by total MV
-                # Temporarily add player and see category improvement
-                self.roster.players.append(player)
-                new_wins = self.roster.get_expected_wins()
-                cat_improvement = new_wins[cat] - current_wins[cat]
-                self.roster.players.pop()
-                cat_values.append((player, cat_improvement))
+            i = CAT_IDX[cat]
+            print(f"\n{cat} (current P(win): {current_wins[i]:.1%}):")
+
+            # Category improvement with each player added
+            cat_values = [(player, wins[i] - current_wins[i])
+                          for player, wins in zip(players, new_wins)]
 
             cat_values.sort(key=lambda x: x[1], reverse=True)
 
@@ -446,8 +496,8 @@ class DraftTool:
                     print("  Usage: search <term>")
                 else:
                     term = arg.lower()
-                    matches = [p for p in self.available
-                              if term in p.name.lower() and p.name not in self.drafted_names]
+                    matches = [p for p, lower, alive in zip(self.available, self._lower_names, self._alive)
+                               if alive and term in lower]
                     if matches:
                         print(f"\n  Found {len(matches)} matches:")
                         for p in matches[:10]:
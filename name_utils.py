@@ -0,0 +1,28 @@
+"""
+Player-name normalization shared by the data scripts.
+
+Projection systems and Fantrax spell the same player differently
+("José Ramírez" vs "Jose Ramirez", "C.J." vs "CJ"), so names are compared
+on a normalized key rather than as raw strings.
+"""
+
+import functools
+import unicodedata
+
+# Punctuation dropped (or turned into spaces) when normalizing names
+_PUNCT_TABLE = str.maketrans({"'": "", "\u2019": "", "-": " ", ".": "", ",": ""})
+
+
+@functools.lru_cache(maxsize=None)
+def normalize(name):
+    """Strip accents, punctuation, and normalize whitespace for name matching.
+
+    Cached: callers normalize the same names many times (every projection
+    array, the Fantrax load, the keeper pass).
+    """
+    # Most names are plain ASCII and have no accents to strip
+    if name.isascii():
+        return ' '.join(name.lower().translate(_PUNCT_TABLE).split())
+    nfkd = unicodedata.normalize('NFKD', name)
+    n = ''.join(c for c in nfkd if not unicodedata.combining(c)).lower()
+    return ' '.join(n.translate(_PUNCT_TABLE).split())
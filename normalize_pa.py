@@ -1,5 +1,7 @@
 import csv
 
+from name_utils import normalize
+
 """
 Normalize The Bat playing time to match Depth Charts.
 
@@ -21,71 +23,88 @@ output_file = '/home/user/FBB/The_Bat_Normalized_PA.csv'
 # Minimum PA filter - only include players with >= MIN_PA in Depth Charts
 MIN_PA = 200
 
+# Counting stats scaled by DC_PA / TheBat_PA (rate stats are left alone)
+COUNTING_STATS = ['AB', 'H', '1B', '2B', '3B', 'HR', 'R', 'RBI', 'BB', 'IBB', 'SO', 'HBP', 'SF', 'SH', 'GDP', 'SB', 'CS']
+
 # Read Depth Charts to get PA by player name (only those meeting MIN_PA threshold)
+# Keyed on normalized names so an accent or punctuation difference between
+# the two systems doesn't silently drop a player (same key as create_league_stats.py)
 dc_pa = {}
 with open(dc_file, 'r', encoding='utf-8-sig') as f:
-    reader = csv.DictReader(f)
+    reader = csv.reader(f)
+    col_idx = {col: i for i, col in enumerate(next(reader))}
+    name_idx = col_idx['Name']
+    pa_idx = col_idx['PA']
     for row in reader:
-        name = row['Name']
+        if not row:
+            continue
+        name = row[name_idx]
         try:
-            pa = float(row['PA'])
+            pa = float(row[pa_idx])
             if pa >= MIN_PA:
-                dc_pa[name] = pa
-        except (ValueError, KeyError):
+                dc_pa[normalize(name)] = pa
+        except (ValueError, IndexError):
             continue
 
 print(f"Loaded {len(dc_pa)} eligible players with >= {MIN_PA} PA from Depth Charts")
 
-# Read The Bat and normalize PA
-normalized_rows = []
+# Read The Bat, normalize PA and write each matched row as it is produced
+examples = []  # (name, thebat_pa, target_pa, scale) for the first 10 matched
 matched = 0
 unmatched = 0
 
 with open(thebat_file, 'r', encoding='utf-8-sig') as f:
-    reader = csv.DictReader(f)
-    fieldnames = reader.fieldnames
-
-    for row in reader:
-        name = row['Name']
-
-        try:
-            thebat_pa = float(row['PA'])
-        except (ValueError, KeyError):
-            continue
-
-        if name in dc_pa and thebat_pa > 0:
-            # Calculate scaling factor
-            target_pa = dc_pa[name]
-            scale = target_pa / thebat_pa
-
-            # Scale counting stats
-            counting_stats = ['AB', 'H', '1B', '2B', '3B', 'HR', 'R', 'RBI', 'BB', 'IBB', 'SO', 'HBP', 'SF', 'SH', 'GDP', 'SB', 'CS']
-
-            new_row = row.copy()
-            new_row['PA'] = str(target_pa)
-
-            for stat in counting_stats:
-                if stat in row and row[stat]:
-                    try:
-                        original = float(row[stat])
-                        new_row[stat] = str(original * scale)
-                    except ValueError:
-                        pass
-
-            normalized_rows.append(new_row)
-            matched += 1
-        else:
-            # Player not in DC eligible pool - skip them (don't include in output)
-            unmatched += 1
+    reader = csv.reader(f)
+    fieldnames = next(reader)
+    col_idx = {col: i for i, col in enumerate(fieldnames)}
+    name_idx = col_idx['Name']
+    pa_idx = col_idx['PA']
+    # Resolve which counting stats this file has once, not per row
+    scaled_idx = [col_idx[stat] for stat in COUNTING_STATS if stat in col_idx]
+
+    # Only open (and truncate) the output once the input header checks out
+    with open(output_file, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        writer.writerow(fieldnames)
+
+        for row in reader:
+            if not row:
+                continue
+            name = row[name_idx]
+
+            try:
+                thebat_pa = float(row[pa_idx])
+            except (ValueError, IndexError):
+                continue
+
+            key = normalize(name)
+            if key in dc_pa and thebat_pa > 0:
+                # Calculate scaling factor
+                target_pa = dc_pa[key]
+                scale = target_pa / thebat_pa
+
+                # Scale counting stats; truncated rows are padded with '' to the
+                # header width, as DictWriter did for missing fields
+                new_row = row + [''] * (len(fieldnames) - len(row))
+                new_row[pa_idx] = str(target_pa)
+
+                for i in scaled_idx:
+                    if new_row[i]:
+                        try:
+                            original = float(new_row[i])
+                            new_row[i] = str(original * scale)
+                        except ValueError:
+                            pass
+
+                writer.writerow(new_row)
+                if matched < 10:
+                    examples.append((name, thebat_pa, target_pa, scale))
+                matched += 1
+            else:
+                # Player not in DC eligible pool - skip them (don't include in output)
+                unmatched += 1
 
 print(f"Matched {matched} players, {unmatched} unmatched (kept original)")
-
-# Write output
-with open(output_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(normalized_rows)
-
 print(f"Created {output_file}")
 
 # Show some examples of the normalization
@@ -93,16 +112,5 @@ print("\nExample normalizations (first 10 matched players):")
 print(f"{'Player':<25} {'TheBat PA':>10} {'DC PA':>10} {'Scale':>8}")
 print("-" * 55)
 
-with open(thebat_file, 'r', encoding='utf-8-sig') as f:
-    reader = csv.DictReader(f)
-    count = 0
-    for row in reader:
-        name = row['Name']
-        if name in dc_pa:
-            thebat_pa = float(row['PA'])
-            target_pa = dc_pa[name]
-            scale = target_pa / thebat_pa
-            print(f"{name:<25} {thebat_pa:>10.1f} {target_pa:>10.1f} {scale:>8.3f}")
-            count += 1
-            if count >= 10:
-                break
+for name, thebat_pa, target_pa, scale in examples:
+    print(f"{name:<25} {thebat_pa:>10.1f} {target_pa:>10.1f} {scale:>8.3f}")